@@ -1,15 +1,774 @@
+import functools
 import re
+from array import array
+
+# Google's RE2 (linear-time, ReDoS-immune DFA engine) is optional; we use
+# it when the bindings are installed and fall back to our own engine if not
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# NumPy + Numba are optional too: with them installed the DFA loop runs as
+# JIT-compiled machine code over an int32 transition table
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _run_dfa(table, accept, buf):
+        # Tight integer loop: one table lookup per input byte
+        state = 0
+        for b in buf:
+            state = table[state, b]
+            if state < 0:
+                return False
+        return accept[state]
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(pattern):
+    # Cache compiled patterns so repeated engines skip the re.compile cost.
+    # The pattern is anchored with \Z up front (wrapped in a group so
+    # alternations stay intact), letting match() replace the slightly
+    # slower fullmatch() round-trip. Wrapping is harmless even when the
+    # pattern already ends in \Z, so no suffix sniffing is needed.
+    return re.compile(r'(?:%s)\Z' % pattern)
+
+
+# Raised when the hand-rolled engine hits syntax it does not support
+class ParseError(Exception):
+    pass
+
+
+# Shorthand classes like \d expand to plain character sets (ASCII only)
+_DIGITS = frozenset('0123456789')
+_WORD = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+_SPACE = frozenset(' \t\n\r\f\v\x1c\x1d\x1e\x1f')  # matches re's \s over ASCII
+_ESCAPE_CLASSES = {
+    'd': (_DIGITS, False), 'D': (_DIGITS, True),
+    'w': (_WORD, False), 'W': (_WORD, True),
+    's': (_SPACE, False), 'S': (_SPACE, True),
+}
+_ESCAPE_LITERALS = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+# Metacharacters that are tokens of their own; frozenset gives an O(1)
+# hashed membership test instead of scanning a literal string
+_SPECIAL = frozenset('()*+?.|')
+
+# Cap on counted repetition: {m,n} expands to m copies plus n-m optionals,
+# so huge counts would blow up compilation; they go to the re fallback
+_MAX_REPEAT = 256
+
+
+# Tokenizer: scans the whole pattern up front into a token list, so
+# next_token and peek are plain list indexing with no rescanning
+class Tokenizer:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.position = 0
+        self.tokens = []
+        while self.position < len(pattern):
+            self.tokens.append(self._scan_token())
+        self.position = 0  # from here on: an index into the token list
+
+    def has_more(self):
+        return self.position < len(self.tokens)
+
+    def peek(self):
+        # Look at the next token without consuming it
+        return self.tokens[self.position]
+
+    def next_token(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _scan_token(self):
+        char = self.pattern[self.position]
+        self.position += 1
+        if char in _SPECIAL:
+            return char
+        elif char == '\\':
+            return self._escape_token()
+        elif char == '[':
+            return self._class_token()
+        elif char == '{':
+            return self._repeat_token()
+        elif char in '^$':
+            raise ParseError(f"Unsupported anchor: {char}")
+        else:
+            return ('CHAR', char)
+
+    def _escape_token(self):
+        # Consume the character after a backslash
+        if self.position >= len(self.pattern):
+            raise ParseError("Dangling backslash")
+        char = self.pattern[self.position]
+        self.position += 1
+        if char in _ESCAPE_CLASSES:
+            chars, negated = _ESCAPE_CLASSES[char]
+            return ('CLASS', chars, negated)
+        elif (char == '0' and self.position < len(self.pattern)
+                and self.pattern[self.position].isdigit()):
+            # \0 followed by another digit is an octal escape in re
+            raise ParseError(f"Unsupported escape: \\0{self.pattern[self.position]}")
+        elif char in _ESCAPE_LITERALS:
+            return ('CHAR', _ESCAPE_LITERALS[char])
+        elif char.isdigit() or char in 'bBAZaxuUN':
+            # Escapes re interprets specially (anchors, backrefs, \a, and
+            # \x/\u/\U/\N codes) must not degrade to literals: punt to re
+            raise ParseError(f"Unsupported escape: \\{char}")
+        else:
+            return ('CHAR', char)
+
+    def _class_token(self):
+        # Consume a [...] character class into a plain set of characters
+        negated = False
+        if self.position < len(self.pattern) and self.pattern[self.position] == '^':
+            negated = True
+            self.position += 1
+        chars = set()
+        first = True
+        while True:
+            if self.position >= len(self.pattern):
+                raise ParseError("Unterminated character class")
+            char = self.pattern[self.position]
+            self.position += 1
+            # A ] as the very first member (after any ^) is a literal in
+            # re, so only a later ] closes the class
+            if char == ']' and not first:
+                return ('CLASS', frozenset(chars), negated)
+            first = False
+            if char == '\\':
+                if self.position >= len(self.pattern):
+                    raise ParseError("Dangling backslash in character class")
+                escaped = self.pattern[self.position]
+                self.position += 1
+                if escaped in _ESCAPE_CLASSES:
+                    inner, inner_negated = _ESCAPE_CLASSES[escaped]
+                    if inner_negated:
+                        raise ParseError(f"Unsupported escape in class: \\{escaped}")
+                    chars.update(inner)
+                    continue
+                if (escaped == '0' and self.position < len(self.pattern)
+                        and self.pattern[self.position].isdigit()):
+                    raise ParseError(f"Unsupported escape in class: \\0{self.pattern[self.position]}")
+                char = _ESCAPE_LITERALS.get(escaped)
+                if char is None:
+                    if escaped.isdigit() or escaped in 'bBAZaxuUN':
+                        # In a class these are backspace, octal or code
+                        # point escapes for re, not literals: punt to re
+                        raise ParseError(f"Unsupported escape in class: \\{escaped}")
+                    char = escaped
+            # A dash between two characters forms a range like a-z
+            if (self.position + 1 < len(self.pattern)
+                    and self.pattern[self.position] == '-'
+                    and self.pattern[self.position + 1] != ']'):
+                end = self.pattern[self.position + 1]
+                self.position += 2
+                if ord(end) < ord(char):
+                    raise ParseError(f"Bad character range: {char}-{end}")
+                chars.update(chr(c) for c in range(ord(char), ord(end) + 1))
+            else:
+                chars.add(char)
+
+    def _repeat_token(self):
+        # Consume a {m}, {m,} or {m,n} repetition count
+        end = self.pattern.find('}', self.position)
+        if end == -1:
+            raise ParseError("Unterminated repetition")
+        body = self.pattern[self.position:end]
+        self.position = end + 1
+        parts = body.split(',')
+        try:
+            if len(parts) == 1:
+                low = high = int(parts[0])
+            elif len(parts) == 2:
+                low = int(parts[0]) if parts[0] else 0
+                high = int(parts[1]) if parts[1] else None
+            else:
+                raise ValueError(body)
+        except ValueError:
+            raise ParseError(f"Bad repetition: {{{body}}}")
+        if low > _MAX_REPEAT or (high is not None and high - low > _MAX_REPEAT):
+            raise ParseError(f"Repetition too large to expand: {{{body}}}")
+        return ('REPEAT', low, high)
+
+
+# Bytecode opcodes for the regex VM (Cox-style). Each instruction is three
+# ints (op, a, b) laid out flat in one contiguous array: CHAR consumes a
+# matching character, CLASS consumes a member of a character class (a is an
+# index into the program's class list), JMP/SPLIT steer control flow, and
+# MATCH accepts.
+OP_CHAR = 0
+OP_CLASS = 1
+OP_JMP = 2
+OP_SPLIT = 3
+OP_MATCH = 4
+
+
+# AST node types produced by the parser. Each knows how to emit itself as
+# bytecode instructions appended to `code`; jump targets get patched in as
+# the emitting node learns where its fragment ends. min_length() gives a
+# lower bound on how many characters the node must consume, letting
+# match() reject too-short input without running the engine.
+class CharNode:
+    def __init__(self, char):
+        self.char = char
+
+    def emit(self, code, classes):
+        code.append([OP_CHAR, ord(self.char), 0])
+
+    def min_length(self):
+        return 1
+
+
+def _class_mask(chars, negated):
+    # Pack a character class into one 128-bit integer: bit i set means the
+    # class accepts chr(i). Membership is then a single shift-and-test.
+    mask = 0
+    for char in chars:
+        if ord(char) < 128:
+            mask |= 1 << ord(char)
+    if negated:
+        mask ^= (1 << 128) - 1
+    return mask
+
+
+class ClassNode:
+    def __init__(self, mask):
+        self.mask = mask
+
+    def emit(self, code, classes):
+        code.append([OP_CLASS, len(classes), 0])
+        classes.append(self.mask)
+
+    def min_length(self):
+        return 1
+
+
+class DotNode:
+    def __init__(self):
+        # Dot is "anything but a newline", i.e. a negated class
+        self.mask = _class_mask(frozenset('\n'), True)
+
+    def emit(self, code, classes):
+        code.append([OP_CLASS, len(classes), 0])
+        classes.append(self.mask)
+
+    def min_length(self):
+        return 1
+
+
+class LiteralRunNode:
+    # A fused run of adjacent literal characters, e.g. the abcd in
+    # abcd.*efg. The prefix fast path consumes it with one startswith();
+    # for the VM it expands back to one CHAR instruction per byte.
+    def __init__(self, literal):
+        self.literal = literal
+
+    def emit(self, code, classes):
+        for byte in self.literal:
+            code.append([OP_CHAR, byte, 0])
+
+    def min_length(self):
+        return len(self.literal)
+
+
+class StarNode:
+    def __init__(self, child):
+        self.child = child
+
+    def emit(self, code, classes):
+        split = len(code)
+        code.append([OP_SPLIT, split + 1, 0])
+        self.child.emit(code, classes)
+        code.append([OP_JMP, split, 0])
+        code[split][2] = len(code)
+
+    def min_length(self):
+        return 0
+
+
+class PlusNode:
+    def __init__(self, child):
+        self.child = child
+
+    def emit(self, code, classes):
+        start = len(code)
+        self.child.emit(code, classes)
+        code.append([OP_SPLIT, start, len(code) + 1])
+
+    def min_length(self):
+        return self.child.min_length()
+
+
+class OptionalNode:
+    def __init__(self, child):
+        self.child = child
+
+    def emit(self, code, classes):
+        split = len(code)
+        code.append([OP_SPLIT, split + 1, 0])
+        self.child.emit(code, classes)
+        code[split][2] = len(code)
+
+    def min_length(self):
+        return 0
+
+
+class RepeatNode:
+    def __init__(self, child, low, high):
+        self.child = child
+        self.low = low
+        self.high = high
+
+    def emit(self, code, classes):
+        # Expand {m,n} into m copies plus optional/starred tails
+        parts = [self.child] * self.low
+        if self.high is None:
+            parts.append(StarNode(self.child))
+        else:
+            parts.extend(OptionalNode(self.child) for _ in range(self.high - self.low))
+        SequenceNode(parts).emit(code, classes)
+
+    def min_length(self):
+        return self.low * self.child.min_length()
+
+
+class SequenceNode:
+    def __init__(self, children=None):
+        self.children = children if children is not None else []
+
+    def add_child(self, child):
+        self.children.append(child)
+
+    def emit(self, code, classes):
+        for child in self.children:
+            child.emit(code, classes)
+
+    def min_length(self):
+        return sum(child.min_length() for child in self.children)
+
+
+class AlternationNode:
+    def __init__(self, options):
+        self.options = options
+
+    def emit(self, code, classes):
+        jumps = []
+        for option in self.options[:-1]:
+            split = len(code)
+            code.append([OP_SPLIT, split + 1, 0])
+            option.emit(code, classes)
+            jumps.append(len(code))
+            code.append([OP_JMP, 0, 0])
+            code[split][2] = len(code)
+        self.options[-1].emit(code, classes)
+        for jump in jumps:
+            code[jump][1] = len(code)
+
+    def min_length(self):
+        return min(option.min_length() for option in self.options)
+
+
+# Parser: turns the token stream into an AST
+class Parser:
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def parse(self):
+        # Iterative parse with an explicit stack instead of recursing into
+        # every ( group: each frame holds the alternative branches seen so
+        # far and the sequence currently being built. No Python call frame
+        # is spent per nesting level, so deeply nested groups are fine.
+        stack = [[[], SequenceNode()]]
+        while self.tokenizer.has_more():
+            token = self.tokenizer.next_token()
+            if token == '(':
+                stack.append([[], SequenceNode()])
+            elif token == ')':
+                if len(stack) == 1:
+                    raise ParseError("Unbalanced parenthesis")
+                node = self._close_frame(stack.pop())
+                stack[-1][1].add_child(self._apply_quantifiers(node))
+            elif token == '|':
+                frame = stack[-1]
+                frame[0].append(self._freeze(frame[1]))
+                frame[1] = SequenceNode()
+            else:
+                if token == '.':
+                    node = DotNode()
+                elif token[0] == 'CHAR':
+                    node = CharNode(token[1])
+                elif token[0] == 'CLASS':
+                    node = ClassNode(_class_mask(token[1], token[2]))
+                else:
+                    raise ParseError(f"Unexpected token: {token!r}")
+                stack[-1][1].add_child(self._apply_quantifiers(node))
+        if len(stack) > 1:
+            raise ParseError("Missing closing parenthesis")
+        return self._close_frame(stack.pop())
+
+    @staticmethod
+    def _freeze(sequence_node):
+        # Fuse adjacent literal characters into single LiteralRunNodes,
+        # then freeze the children: tuple iteration is lighter than list
+        # iteration and the cached AST stays immutable. Lone characters
+        # stay CharNodes so class folding keeps recognizing them.
+        fused = []
+        run = []
+        for child in sequence_node.children:
+            if isinstance(child, CharNode) and ord(child.char) < 128:
+                run.append(child)
+                continue
+            Parser._flush_run(run, fused)
+            fused.append(child)
+        Parser._flush_run(run, fused)
+        sequence_node.children = tuple(fused)
+        return sequence_node
+
+    @staticmethod
+    def _flush_run(run, fused):
+        if len(run) == 1:
+            fused.append(run[0])
+        elif run:
+            fused.append(LiteralRunNode(''.join(c.char for c in run).encode('ascii')))
+        run.clear()
+
+    def _close_frame(self, frame):
+        options, sequence = frame
+        self._freeze(sequence)
+        if not options:
+            return sequence
+        options.append(sequence)
+        folded = self._fold_class(options)
+        if folded is not None:
+            return folded
+        return AlternationNode(options)
+
+    @staticmethod
+    def _fold_class(options):
+        # An alternation of single characters or classes (like a|b|[0-9])
+        # collapses into one ClassNode: SPLIT fan-out becomes one mask test
+        mask = 0
+        for option in options:
+            if len(option.children) != 1:
+                return None
+            child = option.children[0]
+            if isinstance(child, CharNode) and ord(child.char) < 128:
+                mask |= 1 << ord(child.char)
+            elif isinstance(child, (ClassNode, DotNode)):
+                mask |= child.mask
+            else:
+                return None
+        return ClassNode(mask)
+
+    def _apply_quantifiers(self, node):
+        while self.tokenizer.has_more():
+            token = self.tokenizer.peek()
+            if token == '*':
+                node = StarNode(node)
+            elif token == '+':
+                node = PlusNode(node)
+            elif token == '?':
+                if isinstance(node, (StarNode, PlusNode, OptionalNode, RepeatNode)):
+                    raise ParseError("Non-greedy quantifiers are not supported")
+                node = OptionalNode(node)
+            elif token[0] == 'REPEAT':
+                node = RepeatNode(node, token[1], token[2])
+            else:
+                break
+            self.tokenizer.next_token()
+        return node
+
+
+# Compiled form of a pattern: one flat int array of instructions plus the
+# side table of character classes. NFA states are instruction indices, so
+# the structure-of-arrays layout keeps the hot data contiguous instead of
+# chasing AST object pointers around the heap.
+class Program:
+    def __init__(self, code, classes):
+        self.code = code
+        self.classes = classes
+        self.match_pc = len(code) // 3 - 1
+
+    def closure(self, pcs):
+        # Follow JMP/SPLIT edges to get the full set of reachable states
+        stack = list(pcs)
+        seen = set(pcs)
+        code = self.code
+        while stack:
+            pc = stack.pop()
+            base = 3 * pc
+            op = code[base]
+            if op == OP_JMP:
+                targets = (code[base + 1],)
+            elif op == OP_SPLIT:
+                targets = (code[base + 1], code[base + 2])
+            else:
+                continue
+            for target in targets:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+    def step(self, pcs, byte):
+        # All states reachable from this set by consuming one byte
+        moved = set()
+        code = self.code
+        for pc in pcs:
+            base = 3 * pc
+            op = code[base]
+            if op == OP_CHAR:
+                if byte == code[base + 1]:
+                    moved.add(pc + 1)
+            elif op == OP_CLASS:
+                if (self.classes[code[base + 1]] >> byte) & 1:
+                    moved.add(pc + 1)
+        return self.closure(moved)
+
+
+def _split_literal_prefix(ast):
+    # Pull the maximal run of leading literal characters off the pattern so
+    # match() can check it with one startswith() call and skip those
+    # transitions entirely. Returns (prefix, remaining ast).
+    if not isinstance(ast, SequenceNode):
+        return '', ast
+    prefix = []
+    taken = 0
+    for child in ast.children:
+        if isinstance(child, CharNode):
+            prefix.append(child.char)
+        elif isinstance(child, LiteralRunNode):
+            prefix.append(child.literal.decode('ascii'))
+        else:
+            break
+        taken += 1
+    if not prefix:
+        return '', ast
+    return ''.join(prefix), SequenceNode(ast.children[taken:])
+
+
+def compile_to_bytecode(ast):
+    # Lower the AST to a contiguous bytecode array ending in MATCH
+    code = []
+    classes = []
+    ast.emit(code, classes)
+    code.append([OP_MATCH, 0, 0])
+    flat = array('i')
+    for instruction in code:
+        flat.extend(instruction)
+    return Program(flat, classes)
+
+
+# Cap for eager determinization; subset construction can blow up on some
+# patterns, in which case we stay on the lazy per-character DFA
+_MAX_DFA_STATES = 512
+
+
+def _determinize(program, start):
+    # Full subset construction over ASCII, producing an int32 transition
+    # table (num_states x 128) and a boolean accept vector for the JIT loop.
+    # Returns None if the DFA would grow past _MAX_DFA_STATES.
+    index = {start: 0}
+    order = [start]
+    rows = []
+    accepts = [program.match_pc in start]
+    position = 0
+    while position < len(order):
+        states = order[position]
+        position += 1
+        row = [-1] * 128
+        for code in range(128):
+            following = program.step(states, code)
+            if not following:
+                continue
+            if following not in index:
+                if len(index) >= _MAX_DFA_STATES:
+                    return None
+                index[following] = len(index)
+                order.append(following)
+                accepts.append(program.match_pc in following)
+            row[code] = index[following]
+        rows.append(row)
+    table = np.array(rows, dtype=np.int32)
+    return table, np.array(accepts, dtype=np.bool_)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse(pattern):
+    # Cache parsed ASTs so repeated patterns skip tokenizing and parsing
+    return Parser(Tokenizer(pattern)).parse()
+
+
+# Codegen guard: specialized matchers get one flag per NFA state, so very
+# large programs stay on the lazy DFA instead
+_MAX_CODEGEN_STATES = 40
+
+
+def _generate_matcher(program, start):
+    # Partial evaluation: emit straight-line Python source specialized to
+    # this program and exec() it. Every consuming instruction becomes a
+    # boolean flag; each input character updates all flags with hard-coded
+    # tests, so the generic opcode dispatch disappears entirely.
+    code = program.code
+    consuming = [pc for pc in range(len(code) // 3)
+                 if code[3 * pc] in (OP_CHAR, OP_CLASS)]
+    if not consuming or len(consuming) > _MAX_CODEGEN_STATES:
+        return None
+    flag = {pc: i for i, pc in enumerate(consuming)}
+    namespace = {}
+    lines = ['def _matcher(buf):']
+    for pc in consuming:
+        lines.append(f'    s{flag[pc]} = {pc in start}')
+    lines.append(f'    sm = {program.match_pc in start}')
+    lines.append('    for c in buf:')
+    names = [f't{i}' for i in range(len(consuming))] + ['tm']
+    lines.append('        ' + ' = '.join(names) + ' = False')
+    for pc in consuming:
+        base = 3 * pc
+        if code[base] == OP_CHAR:
+            test = f'c == {code[base + 1]}'
+        else:
+            namespace[f'k{flag[pc]}'] = program.classes[code[base + 1]]
+            test = f'(k{flag[pc]} >> c) & 1'
+        successors = program.closure([pc + 1])
+        targets = [f't{flag[q]} = True' for q in successors if q in flag]
+        if program.match_pc in successors:
+            targets.append('tm = True')
+        lines.append(f'        if s{flag[pc]} and {test}:')
+        lines.extend('            ' + target for target in targets)
+    lines.append('        if not (' + ' or '.join(names) + '):')
+    lines.append('            return False')
+    lines.append('        ' + ', '.join(f's{i}' for i in range(len(consuming)))
+                 + ', sm = ' + ', '.join(names))
+    lines.append('    return sm')
+    exec('\n'.join(lines), namespace)
+    return namespace['_matcher']
+
+
+@functools.lru_cache(maxsize=512)
+def _build(pattern):
+    # Compile a pattern once per process and share the result (including
+    # the mutable DFA transition memo) between all engines using it, so a
+    # (state set, char) transition is never computed twice. Raises
+    # ParseError for syntax the hand-rolled engine does not support.
+    ast = _parse(pattern)
+    min_len = ast.min_length()
+    prefix, tail = _split_literal_prefix(ast)
+    program = compile_to_bytecode(tail)
+    start = program.closure([0])
+    dfa_trans = {}
+    dfa_table = dfa_accept = None
+    if njit is not None:
+        determinized = _determinize(program, start)
+        if determinized is not None:
+            dfa_table, dfa_accept = determinized
+    # Without the JIT table, try a matcher specialized to this pattern
+    matcher = None
+    if dfa_table is None:
+        matcher = _generate_matcher(program, start)
+    return min_len, prefix, program, start, dfa_trans, dfa_table, dfa_accept, matcher
 
 
 # Regex Engine to tie everything together
 class RegexEngine:
     def __init__(self, pattern):
-        # Compile the provided regex pattern for matching
-        self.pattern = re.compile(pattern)
+        # Compile the provided regex pattern for matching (cached). The
+        # compiled re pattern stays around as a fallback for syntax the
+        # hand-rolled engine does not understand.
+        self.pattern = _compile(pattern)
+        # Prefer RE2 when available: compiled DFA matching in C with linear
+        # time guarantees. Patterns it rejects (e.g. backrefs) fall through.
+        self.re2_pattern = None
+        if re2 is not None:
+            try:
+                self.re2_pattern = re2.compile(pattern)
+            except re2.error:
+                self.re2_pattern = None
+        try:
+            (self.min_len, self.prefix, self.program, self.start,
+             self.dfa_trans, self.dfa_table, self.dfa_accept,
+             self.matcher) = _build(pattern)
+        except ParseError:
+            self.program = None
 
     def match(self, text):
-        # Use the fullmatch method to check if the entire string matches the pattern
-        return bool(self.pattern.fullmatch(text))
+        if self.program is not None and len(text) < self.min_len:
+            # Shorter than the pattern's lower bound: reject instantly
+            return False
+        if self.re2_pattern is not None:
+            return self.re2_pattern.fullmatch(text) is not None
+        if self.program is None or not text.isascii():
+            # Fall back to the standard library for unsupported patterns
+            # and for non-ASCII input the 128-bit class masks cannot cover;
+            # the pattern is pre-anchored so plain match() suffices
+            return self.pattern.match(text) is not None
+        if self.prefix:
+            # Literal prefix fast path: one C-level comparison replaces a
+            # DFA transition per prefix character
+            if not text.startswith(self.prefix):
+                return False
+            text = text[len(self.prefix):]
+        # Encode once to bytes: indexing bytes yields plain ints, so the
+        # matchers below never allocate one-character strings or call ord()
+        buf = text.encode('ascii')
+        if self.dfa_table is not None:
+            return bool(_run_dfa(self.dfa_table, self.dfa_accept,
+                                 np.frombuffer(buf, dtype=np.uint8)))
+        if self.matcher is not None:
+            # Generated straight-line matcher specialized to this pattern
+            return self.matcher(buf)
+        # Run the lazily determinized DFA: one dict lookup per byte
+        current = self.start
+        for byte in buf:
+            row = self.dfa_trans.setdefault(current, {})
+            following = row.get(byte)
+            if following is None:
+                following = row[byte] = self.program.step(current, byte)
+            current = following
+            if not current:
+                return False
+        return self.program.match_pc in current
+
+
+class _ClassTable(dict):
+    # Translation table mapping a code point to its regex token. ASCII is
+    # precomputed below; anything else is classified on first sight and
+    # cached, so str.translate can do the whole pass in one C call.
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isdigit():
+            token = r'\d'
+        elif char.isalpha():
+            token = r'[a-zA-Z]'
+        elif char.isspace():
+            token = r'\s'
+        else:
+            token = re.escape(char)
+        self[code] = token
+        return token
+
+
+_CLASS_TABLE = _ClassTable()
+for _code in range(128):
+    _CLASS_TABLE[_code]
+
+
+# Precompiled format hints: each check is one C-level scan instead of a
+# chain of Python-level startswith/in passes
+_URL_HINT = re.compile(r'^https?://|www\.')
+_EMAIL_HINT = re.compile(r'@.*\.|\..*@', re.DOTALL)
+_PHONE_HINT = re.compile(r'[\d\s\(\)-]{10,}')
+_ZIP_HINT = re.compile(r'\d{5}(-\d{4})?')
 
 
 def generate_regex_for_string(input_string):
@@ -17,34 +776,25 @@ def generate_regex_for_string(input_string):
     Generate a regex to match common formats like emails, URLs, phone numbers, and ZIP codes.
     """
     # Check for URL patterns
-    if input_string.startswith("http://") or input_string.startswith("https://") or "www." in input_string:
+    if _URL_HINT.search(input_string):
         return r'(http|https):\/\/(www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}([\/a-zA-Z0-9#-]*)?'
 
     # Check for email address patterns
-    elif "@" in input_string and "." in input_string:
+    elif _EMAIL_HINT.search(input_string):
         return r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
 
     # Check for phone number patterns
-    elif re.match(r'[\d\s\(\)-]{10,}', input_string):  # Basic phone number structure
+    elif _PHONE_HINT.match(input_string):  # Basic phone number structure
         return r'(\+?1[-.\s]?)?(\(?\d{3}\)?)[-.\s]?\d{3}[-.\s]?\d{4}'
 
     # Check for ZIP code patterns
-    elif re.match(r'\d{5}(-\d{4})?', input_string):
+    elif _ZIP_HINT.match(input_string):
         return r'\d{5}(-\d{4})?'
 
-    # Default fallback: simple alphanumeric regex
+    # Default fallback: simple alphanumeric regex, classified in a single
+    # translate pass instead of a per-character Python loop
     else:
-        regex_parts = []
-        for char in input_string:
-            if char.isdigit():
-                regex_parts.append(r'\d')
-            elif char.isalpha():
-                regex_parts.append(r'[a-zA-Z]')
-            elif char.isspace():
-                regex_parts.append(r'\s')
-            else:
-                regex_parts.append(re.escape(char))
-        return ''.join(regex_parts)
+        return input_string.translate(_CLASS_TABLE)
 
 
 # User input function
@@ -101,13 +851,34 @@ def test_regex_engine():
         # ZIP codes
         (r'\d{5}(-\d{4})?', "12345", True),
         (r'\d{5}(-\d{4})?', "12345-6789", True),
+
+        # Whitespace includes the ASCII separator controls \x1c-\x1f
+        (r'\s', '\x1c', True),
+        (r'\S', '\x1f', False),
     ]
 
+    # Build each engine once up front instead of re-creating it per case
+    engines = {}
+    for pattern, _, _ in test_cases:
+        if pattern not in engines:
+            engines[pattern] = RegexEngine(pattern)
+
     for pattern, input_str, expected in test_cases:
-        engine = RegexEngine(pattern)
-        result = engine.match(input_str)
+        result = engines[pattern].match(input_str)
         assert result == expected, f'Failed for pattern: {pattern}, input: {input_str}'
 
+    # Cross-check the whole matrix in a single pass: one alternation of
+    # anchored named groups, dispatched by which group matched
+    unique = {}
+    for pattern, _, _ in test_cases:
+        unique.setdefault(pattern, len(unique))
+    batch = re.compile('|'.join(f'(?P<g{index}>{pattern})\\Z'
+                                for pattern, index in unique.items()))
+    for pattern, input_str, expected in test_cases:
+        m = batch.match(input_str)
+        result = m is not None and m.group(f'g{unique[pattern]}') is not None
+        assert result == expected, f'Batch check failed for pattern: {pattern}, input: {input_str}'
+
     print("All tests passed!")
 
 